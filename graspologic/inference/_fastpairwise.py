@@ -0,0 +1,136 @@
+# Copyright (c) Microsoft Corporation and contributors.
+# Licensed under the MIT License.
+
+import numpy as np
+from numba import njit
+from scipy.sparse import issparse
+from sklearn.metrics import pairwise_distances as _sklearn_pairwise_distances
+from sklearn.metrics.pairwise import check_pairwise_arrays
+from sklearn.metrics.pairwise import rbf_kernel as _sklearn_rbf_kernel
+
+# above this many entries in the output matrix, euclidean distances are
+# computed with a single matrix product, which BLAS can multithread. below it,
+# the single-threaded kernel beats sklearn on low-dimensional embeddings
+_MAX_JIT_ENTRIES = 1000 * 1000
+
+
+def pairwise_distances(X, Y=None, metric="euclidean", n_jobs=None, **kwds):
+    """Faster :func:`sklearn.metrics.pairwise_distances` for dense euclidean
+    distances.
+
+    Euclidean distances between small dense inputs are computed by a compiled
+    kernel, which avoids the overhead of sklearn's chunking and process
+    dispatch. Large dense inputs are expanded as
+    :math:`||x||^2 + ||y||^2 - 2 x \\cdot y`, so that the bulk of the work is a
+    single matrix product. Sparse inputs and all other metrics are passed on to
+    sklearn unchanged.
+
+    Parameters
+    ----------
+    X : array-like, shape (n_samples_X, n_features)
+
+    Y : array-like, shape (n_samples_Y, n_features), optional (default=None)
+        If None, distances are computed between the rows of ``X``.
+
+    metric : str or callable (default="euclidean")
+        See :func:`sklearn.metrics.pairwise_distances`.
+
+    n_jobs : int or None (default=None)
+        Number of jobs used by sklearn for metrics other than "euclidean".
+
+    **kwds : optional keyword parameters
+        Passed on to :func:`sklearn.metrics.pairwise_distances`.
+
+    Returns
+    -------
+    D : ndarray, shape (n_samples_X, n_samples_Y)
+    """
+    if metric == "euclidean" and not kwds and not (issparse(X) or issparse(Y)):
+        X, Y = check_pairwise_arrays(X, Y, accept_sparse=False)
+        if X.shape[0] * Y.shape[0] <= _MAX_JIT_ENTRIES:
+            D = np.empty((X.shape[0], Y.shape[0]), dtype=X.dtype)
+            _euclidean(X, Y, D)
+        else:
+            D = _sqeuclidean_via_gemm(X, Y)
+            np.sqrt(D, out=D)
+        return D
+    return _sklearn_pairwise_distances(X, Y, metric=metric, n_jobs=n_jobs, **kwds)
+
+
+def rbf_kernel(X, Y=None, gamma=None):
+    """Same as :func:`sklearn.metrics.pairwise.rbf_kernel`, but exponentiates the
+    squared distances in place rather than allocating a second matrix. Sparse
+    inputs are passed on to sklearn unchanged.
+
+    Parameters
+    ----------
+    X : array-like, shape (n_samples_X, n_features)
+
+    Y : array-like, shape (n_samples_Y, n_features), optional (default=None)
+        If None, the kernel is computed between the rows of ``X``.
+
+    gamma : float or None (default=None)
+        If None, defaults to ``1 / n_features``.
+
+    Returns
+    -------
+    K : ndarray, shape (n_samples_X, n_samples_Y)
+    """
+    if issparse(X) or issparse(Y):
+        return _sklearn_rbf_kernel(X, Y, gamma=gamma)
+    X, Y = check_pairwise_arrays(X, Y, accept_sparse=False)
+    if gamma is None:
+        gamma = 1.0 / X.shape[1]
+    K = _sqeuclidean_via_gemm(X, Y)
+    K *= -gamma
+    np.exp(K, out=K)
+    return K
+
+
+def gaussian(X, workers=None):
+    """Medial gaussian kernel, equivalent to the default kernel of
+    :class:`hyppo.independence.Hsic`.
+
+    The bandwidth is set from the median of the off-diagonal L1 distances
+    between the rows of ``X``.
+
+    Parameters
+    ----------
+    X : array-like, shape (n_samples, n_features)
+
+    workers : int or None (default=None)
+        Number of jobs used by sklearn to compute the L1 distances.
+
+    Returns
+    -------
+    K : ndarray, shape (n_samples, n_samples)
+    """
+    l1 = pairwise_distances(X, metric="l1", n_jobs=workers)
+    n = l1.shape[0]
+    med = np.median(l1[np.triu_indices(n, k=1)])
+    # prevents division by zero when used on label vectors
+    med = med if med else 1
+    return rbf_kernel(X, gamma=1.0 / (2 * med * med))
+
+
+def _sqeuclidean_via_gemm(X, Y):
+    D = X.dot(Y.T)
+    D *= -2
+    D += np.einsum("ij,ij->i", X, X)[:, np.newaxis]
+    D += np.einsum("ij,ij->i", Y, Y)[np.newaxis, :]
+    # rounding can leave small negative values, and a nonzero diagonal
+    np.maximum(D, 0, out=D)
+    if X is Y:
+        np.fill_diagonal(D, 0)
+    return D
+
+
+@njit(fastmath=True, cache=True)
+def _euclidean(A, B, D):
+    for i in range(A.shape[0]):
+        for j in range(B.shape[0]):
+            d = 0.0
+            for k in range(A.shape[1]):
+                diff = A[i, k] - B[j, k]
+                d += diff * diff
+            D[i, j] = np.sqrt(d)
@@ -11,17 +11,16 @@ from ..utils import import_graph, fit_plug_in_variance_estimator
 from ..align import SignFlips
 from ..align import SeedlessProcrustes
 from sklearn.utils import check_array
-from sklearn.metrics import pairwise_distances
+from ._fastpairwise import pairwise_distances, rbf_kernel, gaussian
 from sklearn.metrics.pairwise import pairwise_kernels
 from sklearn.metrics.pairwise import PAIRED_DISTANCES
 from sklearn.metrics.pairwise import PAIRWISE_KERNEL_FUNCTIONS
 from hyppo.ksample import KSample
-from hyppo._utils import gaussian
 from collections import namedtuple
 
 _VALID_DISTANCES = list(PAIRED_DISTANCES.keys())
 _VALID_KERNELS = list(PAIRWISE_KERNEL_FUNCTIONS.keys())
-_VALID_KERNELS.append("gaussian")  # can use hyppo's medial gaussian kernel too
+_VALID_KERNELS.append("gaussian")  # medial gaussian kernel, as in hyppo
 _VALID_METRICS = _VALID_DISTANCES + _VALID_KERNELS
 
 _VALID_TESTS = ["cca", "dcorr", "hhg", "rv", "hsic", "mgc"]
@@ -253,6 +252,12 @@ def latent_distribution_test(
         A1 = import_graph(A1)
         A2 = import_graph(A2)
 
+        if n_components is None:
+            # get the last elbow from ZG for each and take the maximum
+            num_dims1 = select_dimension(A1)[0][-1]
+            num_dims2 = select_dimension(A2)[0][-1]
+            n_components = max(num_dims1, num_dims2)
+
         X1_hat, X2_hat = _embed(A1, A2, n_components)
     else:
         # check for nx objects, since they are castable to arrays,
@@ -300,6 +305,8 @@ def latent_distribution_test(
         X1_hat = check_array(A1)
         X2_hat = check_array(A2)
 
+        n_components = X1_hat.shape[1]
+
     if align_type == "sign_flips":
         aligner = SignFlips(**align_kws)
         X1_hat = aligner.fit_transform(X1_hat, X2_hat)
@@ -378,18 +385,20 @@ def _instantiate_metric_func(metric, test):
                 )
                 warnings.warn(msg, UserWarning)
 
-            def metric_func(X, Y=None, metric=metric, workers=None):
-                return pairwise_kernels(X, Y, metric=metric, n_jobs=workers)
+            if metric == "rbf":
+
+                def metric_func(X, Y=None, workers=None):
+                    return rbf_kernel(X, Y)
+
+            else:
+
+                def metric_func(X, Y=None, metric=metric, workers=None):
+                    return pairwise_kernels(X, Y, metric=metric, n_jobs=workers)
 
     return metric_func
 
 
 def _embed(A1, A2, n_components):
-    if n_components is None:
-        num_dims1 = select_dimension(A1)[0][-1]
-        num_dims2 = select_dimension(A2)[0][-1]
-        n_components = max(num_dims1, num_dims2)
-
     ase = AdjacencySpectralEmbed(n_components=n_components)
     X1_hat = ase.fit_transform(A1)
     X2_hat = ase.fit_transform(A2)
@@ -2,7 +2,6 @@
 # Licensed under the MIT License.
 
 import numpy as np
-from scipy.linalg import orthogonal_procrustes
 
 from ..align import OrthogonalProcrustes
 from ..embed import AdjacencySpectralEmbed, OmnibusEmbed, select_dimension
@@ -68,7 +68,17 @@ def sample_edges(P, directed=False, loops=False):
         return A - np.diag(np.diag(A))
 
 
-def er_np(n, p, directed=False, loops=False, wt=1, wtargs=None, dc=None, dc_kws={}):
+def er_np(
+    n,
+    p,
+    directed=False,
+    loops=False,
+    wt=1,
+    wtargs=None,
+    dc=None,
+    dc_kws={},
+    rng=None,
+):
     r"""
     Samples a Erdos Renyi (n, p) graph with specified edge probability.
 
@@ -123,6 +133,10 @@ def er_np(n, p, directed=False, loops=False, wt=1, wtargs=None, dc=None, dc_kws=
         If not specified, in either case all functions will assume their default
         parameters.
 
+    rng: numpy.random.Generator, optional (default = None)
+        :class:`numpy.random.Generator` object used to sample the edges.
+        If None, edges are sampled from the global random state of ``np.random``.
+
     Returns
     -------
     A : ndarray, shape (n, n)
@@ -164,7 +178,7 @@ def er_np(n, p, directed=False, loops=False, wt=1, wtargs=None, dc=None, dc_kws=
         raise TypeError("directed is not of type bool.")
     n_sbm = np.array([n])
     p_sbm = np.array([[p]])
-    g = sbm(n_sbm, p_sbm, directed, loops, wt, wtargs, dc, dc_kws)
+    g = sbm(n_sbm, p_sbm, directed, loops, wt, wtargs, dc, dc_kws, rng=rng)
     return g
 
 
@@ -313,6 +327,7 @@ def sbm(
     dc=None,
     dc_kws={},
     return_labels=False,
+    rng=None,
 ):
     """
     Samples a graph from the stochastic block model (SBM).
@@ -386,6 +401,10 @@ def sbm(
         be an array with length equal to the number of vertices in the graph, where each
         entry in the array labels which block a vertex in the graph is in.
 
+    rng: numpy.random.Generator, optional (default = None)
+        :class:`numpy.random.Generator` object used to sample the edges.
+        If None, edges are sampled from the global random state of ``np.random``.
+
     References
     ----------
     .. [1] Tai Qin and Karl Rohe. "Regularized spectral clustering under the
@@ -572,6 +591,14 @@ def sbm(
         msg += " functions, not {}".format(type(dc))
         raise ValueError(msg)
 
+    # Check rng
+    if rng is None:
+        # np.random exposes the same sampling methods as a Generator
+        rng = np.random
+    elif not isinstance(rng, np.random.Generator):
+        msg = "rng must be a numpy.random.Generator, not {}.".format(type(rng))
+        raise TypeError(msg)
+
     # End Checks, begin simulation
     A = np.zeros((sum(n), sum(n)))
 
@@ -589,7 +616,7 @@ def sbm(
             cprod = cartesian_product(cmties[i], cmties[j])
             # get idx in 1d coordinates by ravelling
             triu = np.ravel_multi_index((cprod[:, 0], cprod[:, 1]), A.shape)
-            pchoice = np.random.uniform(size=len(triu))
+            pchoice = rng.uniform(size=len(triu))
             if dc is not None:
                 # (v1,v2) connected with probability p*k_i*k_j*dcP[v1]*dcP[v2]
                 num_edges = sum(pchoice < block_p)
@@ -600,9 +627,7 @@ def sbm(
                     msg += " Picking fewer edges"
                     warnings.warn(msg, UserWarning)
                     num_edges = sum(edge_dist > 0)
-                triu = np.random.choice(
-                    triu, size=num_edges, replace=False, p=edge_dist
-                )
+                triu = rng.choice(triu, size=num_edges, replace=False, p=edge_dist)
             else:
                 # connected with probability p
                 triu = triu[pchoice < block_p]
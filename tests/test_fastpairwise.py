@@ -0,0 +1,72 @@
+# Copyright (c) Microsoft Corporation and contributors.
+# Licensed under the MIT License.
+
+import unittest
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from hyppo._utils import gaussian as hyppo_gaussian
+from sklearn.metrics import pairwise_distances as sklearn_pairwise_distances
+from sklearn.metrics.pairwise import rbf_kernel as sklearn_rbf_kernel
+
+from graspologic.inference._fastpairwise import (
+    pairwise_distances,
+    rbf_kernel,
+    gaussian,
+)
+
+
+class TestPairwiseDistances(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        np.random.seed(1234)
+        cls.X = np.random.normal(size=(50, 3))
+        cls.Y = np.random.normal(size=(30, 3))
+
+    def test_euclidean_matches_sklearn(self):
+        D = pairwise_distances(self.X, self.Y)
+        D_sklearn = sklearn_pairwise_distances(self.X, self.Y)
+        self.assertEqual(D.shape, (50, 30))
+        np.testing.assert_allclose(D, D_sklearn)
+
+    def test_euclidean_single_input(self):
+        D = pairwise_distances(self.X)
+        np.testing.assert_allclose(D, sklearn_pairwise_distances(self.X), atol=1e-12)
+        np.testing.assert_array_equal(np.diag(D), 0)
+
+    def test_euclidean_large_input(self):
+        X = np.random.normal(size=(1001, 2))
+        Y = np.random.normal(size=(1000, 2))
+        np.testing.assert_allclose(
+            pairwise_distances(X, Y), sklearn_pairwise_distances(X, Y)
+        )
+        D = pairwise_distances(X)
+        np.testing.assert_allclose(D, sklearn_pairwise_distances(X), atol=1e-7)
+        np.testing.assert_array_equal(np.diag(D), 0)
+
+    def test_rbf_matches_sklearn(self):
+        np.testing.assert_allclose(
+            rbf_kernel(self.X, self.Y), sklearn_rbf_kernel(self.X, self.Y)
+        )
+        np.testing.assert_allclose(
+            rbf_kernel(self.X, gamma=0.3), sklearn_rbf_kernel(self.X, gamma=0.3)
+        )
+
+    def test_gaussian_matches_hyppo(self):
+        np.testing.assert_allclose(gaussian(self.X), hyppo_gaussian(self.X))
+
+    def test_sparse_falls_through(self):
+        X, Y = csr_matrix(self.X), csr_matrix(self.Y)
+        D_sklearn = sklearn_pairwise_distances(self.X, self.Y)
+        np.testing.assert_allclose(pairwise_distances(X, Y), D_sklearn)
+        np.testing.assert_allclose(pairwise_distances(X, self.Y), D_sklearn)
+        np.testing.assert_allclose(rbf_kernel(X, Y), sklearn_rbf_kernel(self.X, self.Y))
+
+    def test_other_metrics_fall_through(self):
+        D = pairwise_distances(self.X, self.Y, metric="l1")
+        D_sklearn = sklearn_pairwise_distances(self.X, self.Y, metric="l1")
+        np.testing.assert_allclose(D, D_sklearn)
+
+    def test_bad_inputs(self):
+        with self.assertRaises(ValueError):
+            pairwise_distances(self.X, self.Y[:, :2])
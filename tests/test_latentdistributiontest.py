@@ -3,37 +3,92 @@
 
 import pytest
 import unittest
+from functools import lru_cache
 import numpy as np
 import networkx as nx
+from scipy.sparse.linalg import eigsh
 from sklearn.metrics import pairwise_distances
 
-from graspologic.embed import AdjacencySpectralEmbed
+from graspologic.embed import AdjacencySpectralEmbed, select_dimension
 from graspologic.inference import latent_distribution_test
 from graspologic.simulations import er_np, sbm
+from graspologic.utils import augment_diagonal
+
+
+@lru_cache(maxsize=32)
+def _er(n, p, seed, directed=False):
+    # cached graphs are shared between tests, so they are made read-only
+    A = er_np(n, p, directed=directed, rng=np.random.default_rng(seed))
+    A.setflags(write=False)
+    return A
+
+
+def _eigsh_ase(A, n_components):
+    # adjacency spectral embedding of a symmetric graph, read directly off the
+    # leading eigenpairs of its diagonally augmented adjacency matrix
+    vals, vecs = eigsh(augment_diagonal(A), k=n_components, which="LM")
+    # ordered by decreasing magnitude, like AdjacencySpectralEmbed
+    order = np.argsort(-np.abs(vals))
+    vals, vecs = vals[order], vecs[:, order]
+    # arpack's start vector is random, so fix the sign of each eigenvector
+    vecs *= np.sign(vecs[np.abs(vecs).argmax(axis=0), np.arange(n_components)])
+    return vecs * np.sqrt(np.abs(vals))
+
+
+@lru_cache(maxsize=1)
+def _sbms():
+    # the three graphs are drawn in sequence from a single generator
+    rng = np.random.default_rng(12345678)
+    B1 = np.array([[0.5, 0.2], [0.2, 0.5]])
+    B2 = np.array([[0.7, 0.2], [0.2, 0.7]])
+    b_size = 200
+    graphs = (
+        sbm(2 * [b_size], B1, rng=rng),
+        sbm(2 * [b_size], B1, rng=rng),
+        sbm(2 * [b_size], B2, rng=rng),
+    )
+    for A in graphs:
+        A.setflags(write=False)
+    return graphs
 
 
 class TestLatentDistributionTest(unittest.TestCase):
+    # graphs are sampled by the cached helpers above when a test first asks
+    # for them, and embeddings by _embed. tests must not modify them in place.
+    _embeddings = {}
+
+    @pytest.fixture(autouse=True)
+    def setup_slow(self, request):
+        # tests marked as slow run fewer bootstraps on smaller graphs with --fast
+        fast = request.config.getoption("--fast")
+        self.n_bootstraps_slow = 20 if fast else 100
+        self.n_vertices_slow = 500 if fast else 1000
+
+    @classmethod
+    def _embed(cls, A, n_components):
+        # the truncated svd dominates the cost of embedding, so each graph is
+        # only embedded once for a given n_components
+        key = (id(A), n_components)
+        if key not in cls._embeddings:
+            ase = AdjacencySpectralEmbed(n_components=n_components)
+            cls._embeddings[key] = ase.fit_transform(A)
+        return cls._embeddings[key]
+
     @classmethod
     def test_ase_works(self):
-        np.random.seed(888)
-        A1 = er_np(20, 0.3)
-        A2 = er_np(20, 0.3)
+        A1, A2 = _er(20, 0.3, seed=888), _er(20, 0.3, seed=889)
         tests = {"dcorr": "euclidean", "hsic": "gaussian", "mgc": "euclidean"}
         for test in tests.keys():
             ldt = latent_distribution_test(A1, A2, test, tests[test], n_bootstraps=10)
 
     def test_workers(self):
-        np.random.seed(888)
-        A1 = er_np(20, 0.3)
-        A2 = er_np(20, 0.3)
+        A1, A2 = _er(20, 0.3, seed=888), _er(20, 0.3, seed=889)
         ldt = latent_distribution_test(
             A1, A2, "dcorr", "euclidean", n_bootstraps=4, workers=4
         )
 
     def test_callable_metric(self):
-        np.random.seed(888)
-        A1 = er_np(20, 0.3)
-        A2 = er_np(20, 0.3)
+        A1, A2 = _er(20, 0.3, seed=888), _er(20, 0.3, seed=889)
 
         def metric_func(X, Y=None, workers=None):
             return pairwise_distances(X, metric="euclidean") * 0.5
@@ -41,9 +96,7 @@ class TestLatentDistributionTest(unittest.TestCase):
         ldt = latent_distribution_test(A1, A2, "dcorr", metric_func, n_bootstraps=10)
 
     def test_bad_kwargs(self):
-        np.random.seed(888)
-        A1 = er_np(20, 0.3)
-        A2 = er_np(20, 0.3)
+        A1, A2 = _er(20, 0.3, seed=888), _er(20, 0.3, seed=889)
 
         # check test argument
         with pytest.raises(TypeError):
@@ -87,16 +140,28 @@ class TestLatentDistributionTest(unittest.TestCase):
             latent_distribution_test(A1, A2, input_graph="hello")
 
     def test_n_bootstraps(self):
-        A1 = er_np(20, 0.3)
-        A2 = er_np(20, 0.3)
+        A1, A2 = _er(20, 0.3, seed=888), _er(20, 0.3, seed=889)
 
         ldt = latent_distribution_test(A1, A2, n_bootstraps=123)
         assert ldt[2]["null_distribution"].shape[0] == 123
 
+    def test_n_components(self):
+        A1, A2 = _er(20, 0.3, seed=888), _er(20, 0.3, seed=889)
+
+        ldt = latent_distribution_test(A1, A2, n_components=2, n_bootstraps=10)
+        self.assertEqual(ldt[2]["n_components"], 2)
+        # the dimension picked by the elbow method is reported too
+        ldt = latent_distribution_test(A1, A2, n_bootstraps=10)
+        n_components = max(select_dimension(A1)[0][-1], select_dimension(A2)[0][-1])
+        self.assertEqual(ldt[2]["n_components"], n_components)
+        # embeddings are used with the dimension they have
+        X1 = self._embed(_er(20, 0.8, seed=123), 2)
+        X2 = self._embed(_er(20, 0.8, seed=124), 2)
+        ldt = latent_distribution_test(X1, X2, input_graph=False, n_bootstraps=10)
+        self.assertEqual(ldt[2]["n_components"], 2)
+
     def test_passing_networkx(self):
-        np.random.seed(123)
-        A1 = er_np(20, 0.8)
-        A2 = er_np(20, 0.8)
+        A1, A2 = _er(20, 0.8, seed=123), _er(20, 0.8, seed=124)
         A1_nx = nx.from_numpy_matrix(A1)
         A2_nx = nx.from_numpy_matrix(A2)
         # check passing nx, when exepect embeddings
@@ -110,15 +175,9 @@ class TestLatentDistributionTest(unittest.TestCase):
         latent_distribution_test(A1_nx, A2_nx, input_graph=True)
 
     def test_passing_embeddings(self):
-        np.random.seed(123)
-        A1 = er_np(20, 0.8)
-        A2 = er_np(20, 0.8)
-        ase_1 = AdjacencySpectralEmbed(n_components=2)
-        X1 = ase_1.fit_transform(A1)
-        ase_2 = AdjacencySpectralEmbed(n_components=2)
-        X2 = ase_2.fit_transform(A2)
-        ase_3 = AdjacencySpectralEmbed(n_components=1)
-        X3 = ase_3.fit_transform(A2)
+        X1 = self._embed(_er(20, 0.8, seed=123), 2)
+        X2 = self._embed(_er(20, 0.8, seed=124), 2)
+        X3 = self._embed(_er(20, 0.8, seed=124), 1)
         # check embeddings having weird ndim
         with self.assertRaises(ValueError):
             latent_distribution_test(X1, X2.reshape(-1, 1, 1), input_graph=False)
@@ -139,23 +198,19 @@ class TestLatentDistributionTest(unittest.TestCase):
         with self.assertRaises(TypeError):
             latent_distribution_test(X1, {"hello": "there"}, input_graph=False)
         # check passing infinite in input (caught by check_array)
+        X1_w_inf = X1.copy()
+        X1_w_inf[1, 1] = np.inf
         with self.assertRaises(ValueError):
-            X1_w_inf = X1.copy()
-            X1_w_inf[1, 1] = np.inf
             latent_distribution_test(X1_w_inf, X2, input_graph=False)
         # check that the appropriate input works
         latent_distribution_test(X1, X2, input_graph=False)
 
     def test_pooled(self):
-        np.random.seed(123)
-        A1 = er_np(20, 0.3)
-        A2 = er_np(100, 0.3)
+        A1, A2 = _er(20, 0.3, seed=123), _er(100, 0.3, seed=123)
         latent_distribution_test(A1, A2, pooled=True)
 
     def test_distances_and_kernels(self):
-        np.random.seed(123)
-        A1 = er_np(20, 0.3)
-        A2 = er_np(100, 0.3)
+        A1, A2 = _er(20, 0.3, seed=123), _er(100, 0.3, seed=123)
         # some valid combinations of test and metric
         # # would love to do this, but currently FutureWarning breaks this
         # with pytest.warns(None) as record:
@@ -175,19 +230,16 @@ class TestLatentDistributionTest(unittest.TestCase):
             latent_distribution_test(A1, A2, "dcorr", "rbf")
 
     def test_bad_matrix_inputs(self):
-        np.random.seed(1234556)
-        A1 = er_np(20, 0.3)
-        A2 = er_np(20, 0.3)
+        A2 = _er(20, 0.3, seed=889)
 
         bad_matrix = [[1, 2]]
         with self.assertRaises(TypeError):
             latent_distribution_test(bad_matrix, A2, test="dcorr")
 
     def test_directed_inputs(self):
-        np.random.seed(2)
-        A = er_np(100, 0.3, directed=True)
-        B = er_np(100, 0.3, directed=True)
-        C = er_np(100, 0.3, directed=False)
+        A = _er(100, 0.3, seed=2, directed=True)
+        B = _er(100, 0.3, seed=3, directed=True)
+        C = _er(100, 0.3, seed=4, directed=False)
 
         # two directed graphs is okay
         latent_distribution_test(A, B)
@@ -199,32 +251,37 @@ class TestLatentDistributionTest(unittest.TestCase):
             latent_distribution_test(C, B)
 
     def test_SBM_dcorr(self):
+        n_bootstraps = 500
+        A1, A2, A3 = _sbms()
+        # A1 is tested against both A2 and A3, so embed each graph only once
+        X1 = self._embed(A1, 2)
+        X2 = self._embed(A2, 2)
+        X3 = self._embed(A3, 2)
+        # the randomized svd behind _embed draws from np.random too, so seed
+        # after embedding in case the embeddings were already memoized
         np.random.seed(12345678)
-        B1 = np.array([[0.5, 0.2], [0.2, 0.5]])
-
-        B2 = np.array([[0.7, 0.2], [0.2, 0.7]])
-        b_size = 200
-        A1 = sbm(2 * [b_size], B1)
-        A2 = sbm(2 * [b_size], B1)
-        A3 = sbm(2 * [b_size], B2)
-        ldt_null = latent_distribution_test(A1, A2)
-        ldt_alt = latent_distribution_test(A1, A3)
+        ldt_null = latent_distribution_test(
+            X1, X2, input_graph=False, n_bootstraps=n_bootstraps
+        )
+        ldt_alt = latent_distribution_test(
+            X1, X3, input_graph=False, n_bootstraps=n_bootstraps
+        )
         self.assertTrue(ldt_null[0] > 0.05)
         self.assertTrue(ldt_alt[0] <= 0.05)
 
+    @pytest.mark.slow
     def test_different_sizes_null(self):
+        A1 = _er(100, 0.8, seed=314)
+        A2 = _er(self.n_vertices_slow, 0.8, seed=315)
         np.random.seed(314)
 
-        A1 = er_np(100, 0.8)
-        A2 = er_np(1000, 0.8)
-
         ldt_not_corrected = latent_distribution_test(
             A1,
             A2,
             test="hsic",
             metric="gaussian",
             n_components=2,
-            n_bootstraps=100,
+            n_bootstraps=self.n_bootstraps_slow,
             size_correction=False,
         )
         ldt_corrected_1 = latent_distribution_test(
@@ -233,7 +290,7 @@ class TestLatentDistributionTest(unittest.TestCase):
             test="hsic",
             metric="gaussian",
             n_components=2,
-            n_bootstraps=100,
+            n_bootstraps=self.n_bootstraps_slow,
             size_correction=True,
         )
         ldt_corrected_2 = latent_distribution_test(
@@ -242,7 +299,7 @@ class TestLatentDistributionTest(unittest.TestCase):
             test="hsic",
             metric="gaussian",
             n_components=2,
-            n_bootstraps=100,
+            n_bootstraps=self.n_bootstraps_slow,
             size_correction=True,
         )
 
@@ -250,19 +307,19 @@ class TestLatentDistributionTest(unittest.TestCase):
         self.assertTrue(ldt_corrected_1[0] > 0.05)
         self.assertTrue(ldt_corrected_2[0] > 0.05)
 
-    def test_different_sizes_null(self):
+    @pytest.mark.slow
+    def test_different_sizes_alt(self):
+        A1 = _er(100, 0.8, seed=314)
+        A2 = _er(self.n_vertices_slow, 0.7, seed=315)
         np.random.seed(314)
 
-        A1 = er_np(100, 0.8)
-        A2 = er_np(1000, 0.7)
-
         ldt_corrected_1 = latent_distribution_test(
             A1,
             A2,
             test="hsic",
             metric="gaussian",
             n_components=2,
-            n_bootstraps=100,
+            n_bootstraps=self.n_bootstraps_slow,
             size_correction=True,
         )
         ldt_corrected_2 = latent_distribution_test(
@@ -271,7 +328,7 @@ class TestLatentDistributionTest(unittest.TestCase):
             test="hsic",
             metric="gaussian",
             n_components=2,
-            n_bootstraps=100,
+            n_bootstraps=self.n_bootstraps_slow,
             size_correction=True,
         )
 
@@ -280,13 +337,8 @@ class TestLatentDistributionTest(unittest.TestCase):
 
     def test_different_aligners(self):
         np.random.seed(314)
-        A1 = er_np(100, 0.8)
-        A2 = er_np(100, 0.8)
-        ase_1 = AdjacencySpectralEmbed(n_components=2)
-        X1 = ase_1.fit_transform(A1)
-        ase_2 = AdjacencySpectralEmbed(n_components=2)
-        X2 = ase_2.fit_transform(A2)
-        X2 = -X2
+        X1 = _eigsh_ase(_er(100, 0.8, seed=314), 2)
+        X2 = -_eigsh_ase(_er(100, 0.8, seed=315), 2)
 
         ldt_1 = latent_distribution_test(X1, X2, input_graph=False, align_type=None)
         self.assertTrue(ldt_1[0] < 0.05)
@@ -47,6 +47,13 @@ class Test_ER(unittest.TestCase):
         self.assertTrue(np.isclose(dind.sum() / float(len(dind)), self.p, atol=0.02))
         self.assertTrue(A.shape == (self.n, self.n))
 
+    def test_ernp_rng(self):
+        A = er_np(self.n, self.p, rng=np.random.default_rng(123456))
+        B = er_np(self.n, self.p, rng=np.random.default_rng(123456))
+        self.assertTrue(np.array_equal(A, B))
+        self.assertTrue(is_symmetric(A))
+        self.assertTrue(A.shape == (self.n, self.n))
+
 
 class Test_ZINM(unittest.TestCase):
     @classmethod
@@ -397,6 +404,19 @@ class Test_WSBM(unittest.TestCase):
         self.assertTrue(A.shape == (np.sum(n), np.sum(n)))
         pass
 
+    def test_sbm_rng(self):
+        A = sbm(self.n, self.Pns, directed=True, rng=np.random.default_rng(self.seed))
+        B = sbm(self.n, self.Pns, directed=True, rng=np.random.default_rng(self.seed))
+        self.assertTrue(np.array_equal(A, B))
+        self.assertFalse(is_symmetric(A))
+        self.assertTrue(is_loopless(A))
+
+        # degree corrected sampling also draws from rng
+        dc = np.concatenate([np.ones(k) / k for k in self.n])
+        A = sbm(self.n, self.Psy, dc=dc, rng=np.random.default_rng(self.seed))
+        B = sbm(self.n, self.Psy, dc=dc, rng=np.random.default_rng(self.seed))
+        self.assertTrue(np.array_equal(A, B))
+
     def test_sbm_singlewt_undirected_loopless(self):
         np.random.seed(12345)
         wt = np.random.normal
@@ -817,6 +837,10 @@ class Test_WSBM(unittest.TestCase):
             dc_kws = [1] + [{}] * (len(self.n) - 1)
             sbm(self.n, self.Psy, dc=dc, dc_kws=dc_kws)
 
+        with self.assertRaises(TypeError):
+            # rng must be a Generator
+            sbm(self.n, self.Psy, rng=np.random.RandomState(self.seed))
+
 
 class Test_RDPG(unittest.TestCase):
     @classmethod